@@ -0,0 +1,294 @@
+"""
+Micro-benchmarks over the hot paths of cantrips. They only need the standard
+  library (timeit), so they run offline.
+
+Usage:
+
+  # run the suite and store the results as the baseline
+  python benchmarks/run.py --output baseline.json
+
+  # run the suite again and compare it against the baseline
+  python benchmarks/run.py --compare baseline.json --threshold 0.1
+
+The results (JSON) go to the --output file, or to stdout. In compare mode, the
+  report goes to stderr, and the process exits with status 1 if the median time
+  of any benchmark became slower than the baseline by more than the threshold (a
+  fraction: 0.1 means 10%) AND by more than the noise measured in both runs
+  (three times their combined median absolute deviation, relative to the
+  median). Benchmarks flagged as regressions are measured again (up to --retries
+  times), and only reported if the new measurement confirms the regression.
+  Comparing against a baseline taken with another python version or
+  implementation is refused (exit status 2) unless --ignore-interpreter is given.
+"""
+import os
+import sys
+import json
+import math
+import random
+import timeit
+import statistics
+import argparse
+import platform
+from functools import wraps
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cantrips.entropy import weighted_random
+from cantrips.types.frozen import frozendict
+from cantrips.types.events import Eventful
+from cantrips.types.arguments import Arguments
+from cantrips.patterns.singleton import Singleton
+from cantrips.decorators import customizable
+from cantrips.functions import normalize_arguments
+
+
+BENCHMARKS = {}
+SEED = 0
+
+
+def benchmark(name):
+    """
+    Registers a benchmark. The decorated function performs the setup, and returns
+      the no-arguments callable which will be timed.
+    """
+    def _register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return _register
+
+
+@benchmark('weighted_random[100]')
+def _weighted_random_100():
+    weights = [('item%d' % index, index + 1) for index in range(100)]
+    return lambda: weighted_random(weights)
+
+
+@benchmark('weighted_random[10000]')
+def _weighted_random_10000():
+    weights = {'item%d' % index: index + 1 for index in range(10000)}
+    return lambda: weighted_random(weights)
+
+
+@benchmark('frozendict.__hash__[1000]:fresh')
+def _frozendict_hash_fresh():
+    items = [('key%d' % index, index) for index in range(1000)]
+    return lambda: hash(frozendict(items))
+
+
+@benchmark('frozendict.__hash__[1000]:cached')
+def _frozendict_hash_cached():
+    value = frozendict(('key%d' % index, index) for index in range(1000))
+    hash(value)
+    return lambda: hash(value)
+
+
+@benchmark('Eventful.Event.trigger[10]')
+def _event_trigger():
+    events = Eventful(('changed',))
+    for index in range(10):
+        events.changed.register(index, lambda *args, **kwargs: None)
+    return lambda: events.changed.trigger(1, 2, key='value')
+
+
+@benchmark('Arguments.__getattr__')
+def _arguments_getattr():
+    arguments = Arguments(1, 2, 3, foo=1, bar=2, baz=3)
+    return lambda: arguments.baz
+
+
+@benchmark('Singleton.__call__')
+def _singleton_call():
+    class Unique(metaclass=Singleton):
+        pass
+    Unique()
+    return Unique
+
+
+@benchmark('customizable:decorate')
+def _customizable_decorate():
+    def implementation(function, prefix='x'):
+        @wraps(function)
+        def _wrapper(*args, **kwargs):
+            return function(*args, **kwargs)
+        return _wrapper
+    decorator = customizable(implementation, prefix='y')
+
+    def function(a, b=1):
+        return a
+
+    return lambda: decorator(prefix='z')(function)
+
+
+@benchmark('customizable:decorate-directly')
+def _customizable_decorate_directly():
+    def implementation(function, prefix='x'):
+        @wraps(function)
+        def _wrapper(*args, **kwargs):
+            return function(*args, **kwargs)
+        return _wrapper
+    decorator = customizable(implementation, prefix='y')
+
+    def function(a, b=1):
+        return a
+
+    return lambda: decorator(function)
+
+
+@benchmark('normalize_arguments')
+def _normalize_arguments():
+    def function(a, b=2, *args, c, d=4, **kwargs):
+        pass
+    return lambda: normalize_arguments(function, (1,), {'c': 3})
+
+
+def summary(timings, number):
+    """
+    Summarizes the timings (per call, in seconds) of a benchmark.
+    """
+    median = statistics.median(timings)
+    return {
+        'best': min(timings),
+        'worst': max(timings),
+        'median': median,
+        'mad': statistics.median([abs(timing - median) for timing in timings]),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'number': number,
+        'repeat': len(timings),
+        'timings': timings,
+    }
+
+
+def run(names, repeat, min_time):
+    """
+    Runs the given benchmarks. Each one is calibrated to take at least min_time
+      seconds per repetition, and the times (per call, in seconds) among the
+      repetitions are reported along with their summary. The random generator is
+      seeded before each repetition, so every run does the same work.
+    """
+    results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'benchmarks': {},
+    }
+    for name in names:
+        timer = timeit.Timer(BENCHMARKS[name](), setup=lambda: random.seed(SEED))
+        number, elapsed = 1, 0
+        while elapsed < min_time:
+            number *= 10
+            elapsed = timer.timeit(number)
+        timings = [total / number for total in timer.repeat(repeat, number)]
+        results['benchmarks'][name] = summary(timings, number)
+        print("%-40s %12.3f us" % (name, statistics.median(timings) * 1e6), file=sys.stderr)
+    return results
+
+
+def _noise(result):
+    """
+    Relative spread among the repetitions of a benchmark: the median absolute
+      deviation (scaled to be comparable to a standard deviation) over the median.
+      Unlike the worst/best spread, a single outlier does not change it.
+    """
+    return 1.4826 * result['mad'] / result['median']
+
+
+def interpreter_mismatch(baseline, current):
+    """
+    Tells whether two runs were taken with different python versions or implementations.
+    """
+    return (baseline.get('python'), baseline.get('implementation')) != \
+        (current.get('python'), current.get('implementation'))
+
+
+def compare(baseline, current, threshold, report=True):
+    """
+    Compares the median timings of two runs. Returns the names of the benchmarks
+      that became slower by more than the threshold and by more than three times
+      the noise measured in both runs (combined). The report goes to stderr,
+      unless report is False.
+    """
+    regressions = []
+    for name, result in sorted(current['benchmarks'].items()):
+        if name not in baseline['benchmarks']:
+            if report:
+                print("%-40s %12s" % (name, "(new)"), file=sys.stderr)
+            continue
+        reference = baseline['benchmarks'][name]
+        ratio = result['median'] / reference['median'] - 1
+        noise = 3 * math.hypot(_noise(reference), _noise(result))
+        regressed = ratio > threshold and ratio > noise
+        if regressed:
+            regressions.append(name)
+        if report:
+            print("%-40s %+11.1f%% (noise %5.1f%%) %s" % (name, ratio * 100, noise * 100,
+                                                         "REGRESSION" if regressed else ""), file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the cantrips micro-benchmarks.")
+    parser.add_argument('names', nargs='*', help="Benchmarks to run (default: all of them)")
+    parser.add_argument('--output', '-o', help="Write the results (JSON) to this file")
+    parser.add_argument('--input', '-i', help="Load the results (JSON) from this file instead of running")
+    parser.add_argument('--compare', '-c', help="Compare the results against this baseline (JSON)")
+    parser.add_argument('--threshold', '-t', type=float, default=0.1,
+                        help="Allowed slowdown, as a fraction, before flagging a regression (default: 0.1)")
+    parser.add_argument('--repeat', '-r', type=int, default=5, help="Repetitions per benchmark (default: 5)")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="Minimum seconds per repetition (default: 0.2)")
+    parser.add_argument('--retries', type=int, default=2,
+                        help="Times to measure again (replacing their results) the benchmarks flagged as "
+                             "regressions (default: 2)")
+    parser.add_argument('--ignore-interpreter', action='store_true',
+                        help="Compare even if the baseline was taken with another python")
+    parser.add_argument('--list', '-l', action='store_true', help="List the available benchmarks and exit")
+    options = parser.parse_args(argv)
+
+    if options.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    unknown = [name for name in options.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: %s" % ", ".join(unknown))
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+
+    if options.input:
+        with open(options.input) as f:
+            results = json.load(f)
+    else:
+        results = run(options.names or list(BENCHMARKS), options.repeat, options.min_time)
+
+    if baseline is not None:
+        if interpreter_mismatch(baseline, results):
+            print("Baseline taken with %s %s, but current results with %s %s" % (
+                baseline.get('implementation'), baseline.get('python'),
+                results.get('implementation'), results.get('python')), file=sys.stderr)
+            if not options.ignore_interpreter:
+                return 2
+        if not options.input:
+            for _ in range(options.retries):
+                flagged = compare(baseline, results, options.threshold, report=False)
+                if not flagged:
+                    break
+                print("Measuring again: %s" % ", ".join(flagged), file=sys.stderr)
+                results['benchmarks'].update(run(flagged, options.repeat, options.min_time)['benchmarks'])
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if baseline is not None and compare(baseline, results, options.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,9 @@
 from __future__ import absolute_import
 import types
+import inspect
+from operator import itemgetter
+from weakref import ref
+from cantrips.types.arguments import Arguments
 
 METHOD_CLASS = 1
 METHOD_INSTANCE = 2
@@ -7,6 +11,16 @@ METHOD_BOUND = 4
 METHOD_UNBOUND = 8
 METHOD_ALL = METHOD_CLASS | METHOD_INSTANCE | METHOD_BOUND | METHOD_UNBOUND
 
+CALLABLE_FUNCTION = 1
+CALLABLE_BOUND_METHOD = 2
+CALLABLE_CLASSMETHOD = 4
+CALLABLE_STATICMETHOD = 8
+CALLABLE_COROUTINE = 16
+CALLABLE_BUILTIN = 32
+
+_BUILTIN_TYPES = (types.BuiltinFunctionType, type(object.__init__), type(object().__str__), type(str.join),
+                  type(dict.__dict__['fromkeys']))
+
 
 def is_method(method, flags=METHOD_ALL):
     """
@@ -16,18 +30,19 @@ def is_method(method, flags=METHOD_ALL):
       * Being bound method.
       * Being unbound method.
     Flag check is considered or-wise. The default is to consider every option.
+    Python 3 has no unbound methods (they are plain functions), so every method
+      is a bound one and METHOD_UNBOUND alone never matches.
     :param method:
     :param flags:
     :return:
     """
     if isinstance(method, types.MethodType):
-        if flags & METHOD_CLASS and issubclass(method.im_class, type):
+        is_class = isinstance(method.__self__, type)
+        if flags & METHOD_CLASS and is_class:
             return True
-        if flags & METHOD_INSTANCE and not issubclass(method.im_class, type):
+        if flags & METHOD_INSTANCE and not is_class:
             return True
-        if flags & METHOD_BOUND and method.im_self is not None:
-            return True
-        if flags & METHOD_UNBOUND and method.im_self is None:
+        if flags & METHOD_BOUND:
             return True
     return False
 
@@ -41,4 +56,294 @@ def is_static(method):
     return isinstance(method, types.FunctionType)
 
 
-is_function = is_static
\ No newline at end of file
+is_function = is_static
+
+
+def callable_kind(value):
+    """
+    Classifies the passed value, returning a combination of CALLABLE_* flags:
+      * CALLABLE_FUNCTION: a plain python function (this includes static methods
+        retrieved through their class or instance).
+      * CALLABLE_BOUND_METHOD: a method bound to an instance or class (python or
+        builtin).
+      * CALLABLE_CLASSMETHOD: a classmethod object, or a method bound to a class
+        (python or builtin, e.g. dict.fromkeys).
+      * CALLABLE_STATICMETHOD: a staticmethod object.
+      * CALLABLE_COROUTINE: the underlying function is a coroutine function.
+      * CALLABLE_BUILTIN: a builtin function, method or slot wrapper.
+    Other callables (e.g. classes or instances implementing __call__) return 0.
+    :param value:
+    :return:
+    """
+    if isinstance(value, staticmethod):
+        kind, function = CALLABLE_STATICMETHOD, value.__func__
+    elif isinstance(value, classmethod):
+        kind, function = CALLABLE_CLASSMETHOD, value.__func__
+    elif isinstance(value, types.MethodType):
+        kind, function = CALLABLE_BOUND_METHOD, value.__func__
+        if isinstance(value.__self__, type):
+            kind |= CALLABLE_CLASSMETHOD
+    elif isinstance(value, types.FunctionType):
+        kind, function = CALLABLE_FUNCTION, value
+    elif isinstance(value, _BUILTIN_TYPES):
+        kind = CALLABLE_BUILTIN
+        owner = getattr(value, '__self__', None)
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            kind |= CALLABLE_BOUND_METHOD
+            if isinstance(owner, type):
+                kind |= CALLABLE_CLASSMETHOD
+        return kind
+    else:
+        return 0
+    if inspect.iscoroutinefunction(function):
+        kind |= CALLABLE_COROUTINE
+    return kind
+
+
+class _Slot(object):
+    """
+    Placeholder used while computing a binding plan. It tells the index (in the
+      pool of call values) where the actual value will come from.
+    """
+
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        self.index = index
+
+
+def _getter(indices):
+    """
+    Makes a function picking the given indices from a tuple, as a tuple.
+    """
+    if not indices:
+        return lambda pool: ()
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda pool: (pool[index],)
+    return itemgetter(*indices)
+
+
+class _Plan(object):
+    """
+    A binding plan for a specific call shape (amount of positional arguments and
+      names of the keyword arguments) and a specific shape of the defaults (the
+      amount of __defaults__ and the names in __kwdefaults__). It tells, for the
+      canonical positional and keyword arguments, which index of the pool of call
+      values they take.
+    """
+
+    __slots__ = ('args', 'kwargs', 'kwdefaults')
+
+    def __init__(self, signature, nargs, kwnames, ndefaults, kwdefaults):
+        """
+        Binds placeholders against the signature, applying defaults. Which
+          parameters have a default value is told by ndefaults and kwdefaults
+          (i.e. by the function being called), and not by the signature.
+        """
+        npositionals = len([parameter for parameter in signature.parameters.values()
+                            if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)])
+        base = nargs + len(kwnames)
+        slots, parameters = {}, []
+        for position, parameter in enumerate(signature.parameters.values()):
+            if parameter.kind == parameter.KEYWORD_ONLY:
+                slot = _Slot(base + ndefaults + len(slots)) if parameter.name in kwdefaults else None
+            elif parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+                index = position - (npositionals - ndefaults)
+                slot = _Slot(base + index) if index >= 0 else None
+            else:
+                slot = None
+            if slot is not None and parameter.kind == parameter.KEYWORD_ONLY:
+                slots[parameter.name] = slot
+            parameters.append(parameter.replace(default=parameter.empty if slot is None else slot))
+        signature = signature.replace(parameters=parameters)
+        values = [_Slot(index) for index in range(base)]
+        bound = signature.bind(*values[:nargs], **dict(zip(kwnames, values[nargs:])))
+        bound.apply_defaults()
+        self.args = _getter(tuple(slot.index for slot in bound.args))
+        self.kwargs = tuple((name, slot.index) for name, slot in bound.kwargs.items())
+        self.kwdefaults = tuple(slots)
+
+
+def _has_signature(value):
+    """
+    Tells whether a value has an explicit __signature__ (inspect.unwrap stops there).
+    """
+    return hasattr(value, '__signature__')
+
+
+class _Binder(object):
+    """
+    Cached signature of a python function, and its binding plans by call shape.
+      It holds a snapshot of what the signature depends on (the code, defaults and
+      annotations of the unwrapped function), to tell when it became stale.
+    """
+
+    __slots__ = ('function', 'target', 'code', 'defaults', 'kwdefaults', 'nkwdefaults', 'annotations', 'signature', 'plans',
+                 '_bound_signature')
+
+    def __init__(self, function):
+        target = inspect.unwrap(function, stop=_has_signature)
+        if not isinstance(target, types.FunctionType) or _has_signature(target):
+            target = None
+        self.target = target
+        if target is not None:
+            self.code = target.__code__
+            self.defaults = target.__defaults__
+            self.kwdefaults = target.__kwdefaults__
+            self.nkwdefaults = len(target.__kwdefaults__ or ())
+            self.annotations = target.__annotations__
+            self.signature = inspect.signature(target)
+            self.plans = {}
+            self._bound_signature = None
+
+    def stale(self):
+        """
+        Tells whether the signature and binding plans no longer apply to the target
+          function (its code, defaults or annotations were reassigned).
+        """
+        target = self.target
+        return (target.__code__ is not self.code or target.__defaults__ is not self.defaults or
+                target.__kwdefaults__ is not self.kwdefaults or
+                len(target.__kwdefaults__ or ()) != self.nkwdefaults or
+                target.__annotations__ is not self.annotations)
+
+    @property
+    def bound_signature(self):
+        """
+        The signature without its implicit first argument (like for a bound method).
+        """
+        if self._bound_signature is None:
+            parameters = tuple(self.signature.parameters.values())
+            if parameters and parameters[0].kind in (parameters[0].POSITIONAL_ONLY,
+                                                     parameters[0].POSITIONAL_OR_KEYWORD):
+                parameters = parameters[1:]
+            self._bound_signature = self.signature.replace(parameters=parameters)
+        return self._bound_signature
+
+    def plan(self, key):
+        """
+        Creates the plan for a (nargs, kwnames, bound) key. When bound is true, the
+          plan is computed without the implicit first argument.
+        """
+        nargs, kwnames, bound = key
+        plan = self.plans[key] = _Plan(self.bound_signature if bound else self.signature, nargs, kwnames,
+                                       len(self.defaults or ()), self.kwdefaults or {})
+        return plan
+
+
+_BINDERS = {}
+
+
+def _binder(function):
+    """
+    Gets (creating it if absent or stale) the binder for a python function. Binders
+      are kept by the identity of the function, and dropped when it is collected.
+    """
+    key = id(function)
+    binder = _BINDERS.get(key)
+    if binder is not None and binder.function() is function and (binder.target is None or not binder.stale()):
+        return binder
+    binder = _Binder(function)
+
+    def _forget(_):
+        if _BINDERS.get(key) is binder:
+            del _BINDERS[key]
+
+    binder.function = ref(function, _forget)
+    _BINDERS[key] = binder
+    return binder
+
+
+
+def _resolve(value):
+    """
+    Resolves the python function whose code will run when calling a value that
+      is neither a function nor a method, as a (function, owner) pair, where owner
+      is the implicit first argument (e.g. self), or None. Returns (None, None)
+      when there is no such function: classes (whose signature depends on many
+      attributes that can change anytime), builtins, and callable instances with
+      their own __signature__ or __wrapped__.
+    """
+    if isinstance(value, (staticmethod, classmethod)):
+        return value.__func__, None
+    if isinstance(value, (type,) + _BUILTIN_TYPES):
+        return None, None
+    if hasattr(value, '__wrapped__') or getattr(value, '__signature__', None) is not None:
+        return None, None
+    call = getattr(type(value), '__call__', None)
+    if isinstance(call, types.FunctionType):
+        return call, value
+    return None, None
+
+
+def get_signature(value):
+    """
+    Same as inspect.signature, but caching the result for python functions,
+      methods, and instances implementing __call__ in python. The cache is kept
+      by the identity of the function, and refreshed when its code, defaults or
+      annotations are reassigned.
+    :param value:
+    :return:
+    """
+    kind = type(value)
+    if kind is types.FunctionType:
+        function, owner = value, None
+    elif kind is types.MethodType:
+        function, owner = value.__func__, value.__self__
+    else:
+        function, owner = _resolve(value)
+        if function is None:
+            return inspect.signature(value)
+    binder = _binder(function)
+    if binder.target is None:
+        return inspect.signature(value)
+    return binder.signature if owner is None else binder.bound_signature
+
+
+def normalize_arguments(value, args=(), kwargs=None):
+    """
+    Binds the given positional and keyword arguments to the signature of a
+      callable, and returns them in a canonical Arguments form: defaults are
+      applied, positional-or-keyword parameters are given positionally, and
+      keyword-only or extra keyword arguments are given by name. The implicit
+      first argument of bound methods is not included.
+
+    Binding plans are cached by the identity of the function and the shape of
+      the call, so repeated calls are quite cheap. Other callables (e.g. classes
+      or builtins) are bound using inspect directly.
+    :param value: The callable to bind the arguments against.
+    :param args: A tuple of positional arguments.
+    :param kwargs: A dict of keyword arguments.
+    :return: An Arguments instance.
+    """
+    kind = type(value)
+    if kind is types.FunctionType:
+        function, owner = value, None
+    elif kind is types.MethodType:
+        function, owner = value.__func__, value.__self__
+    else:
+        function, owner = _resolve(value)
+    if function is not None:
+        binder = _BINDERS.get(id(function))
+        if binder is None or binder.function() is not function or (binder.target is not None and binder.stale()):
+            binder = _binder(function)
+        if binder.target is not None:
+            args = tuple(args)
+            if kwargs:
+                key = (len(args), tuple(kwargs), owner is not None)
+                pool = args + tuple(kwargs.values())
+            else:
+                key = (len(args), (), owner is not None)
+                pool = args
+            plan = binder.plans.get(key) or binder.plan(key)
+            defaults = binder.defaults
+            if defaults:
+                pool += defaults
+            if plan.kwdefaults:
+                kwdefaults = binder.kwdefaults
+                pool += tuple([kwdefaults[name] for name in plan.kwdefaults])
+            return Arguments(*plan.args(pool), **{name: pool[index] for name, index in plan.kwargs})
+    bound = inspect.signature(value).bind(*args, **(kwargs or {}))
+    bound.apply_defaults()
+    return Arguments(*bound.args, **bound.kwargs)
@@ -8,9 +8,9 @@ class Arguments(object):
         the current object.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(*args, **kwargs):
         """
-        You can specify any set of arguments.
+        You can specify any set of arguments (even one named 'self').
 
         Please consider that names like 'args' and 'kwargs' are
             occupied by special property names. If you use them,
@@ -19,8 +19,9 @@ class Arguments(object):
             o.kwargs['args']
             o.kwargs['kwargs']
         """
-        super().__setattr__('_Arguments__args', args)
-        super().__setattr__('_Arguments__kwargs', kwargs)
+        self, args = args[0], args[1:]
+        object.__setattr__(self, '_Arguments__args', args)
+        object.__setattr__(self, '_Arguments__kwargs', kwargs)
 
     def __len__(self):
         """
@@ -0,0 +1,108 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import importlib.util
+from io import StringIO
+from contextlib import redirect_stdout, redirect_stderr
+
+
+_spec = importlib.util.spec_from_file_location(
+    'benchmarks_run', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'run.py'))
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+
+def _results(python='3.11.7', implementation='CPython', **timings):
+    return {
+        'python': python,
+        'implementation': implementation,
+        'benchmarks': {name: bench.summary(values, 1000) for name, values in timings.items()},
+    }
+
+
+class CompareTest(unittest.TestCase):
+
+    def compare(self, baseline, current, threshold=0.1):
+        return bench.compare(baseline, current, threshold, report=False)
+
+    def test_steady_run_is_not_flagged(self):
+        baseline = _results(a=[1.0, 1.01, 1.02, 1.01, 1.0])
+        current = _results(a=[1.02, 1.0, 1.03, 1.01, 1.01])
+        self.assertEqual(self.compare(baseline, current), [])
+
+    def test_slowdown_is_flagged(self):
+        baseline = _results(a=[1.0, 1.01, 1.02, 1.01, 1.0], b=[2.0] * 5)
+        current = _results(a=[1.3] * 5, b=[2.0] * 5)
+        self.assertEqual(self.compare(baseline, current), ['a'])
+
+    def test_outlier_does_not_hide_a_slowdown(self):
+        baseline = _results(a=[1.0, 1.01, 1.02, 1.01, 1.40])
+        current = _results(a=[1.30] * 5)
+        self.assertEqual(self.compare(baseline, current), ['a'])
+
+    def test_slowdown_below_threshold_is_not_flagged(self):
+        baseline = _results(a=[1.0] * 5)
+        current = _results(a=[1.05] * 5)
+        self.assertEqual(self.compare(baseline, current), [])
+
+    def test_slowdown_within_noise_is_not_flagged(self):
+        baseline = _results(a=[1.0, 1.3, 0.7, 1.2, 0.8])
+        current = _results(a=[1.2, 1.5, 0.9, 1.4, 1.0])
+        self.assertEqual(self.compare(baseline, current), [])
+
+    def test_new_benchmarks_are_ignored(self):
+        baseline = _results(a=[1.0] * 5)
+        current = _results(a=[1.0] * 5, b=[9.0] * 5)
+        self.assertEqual(self.compare(baseline, current), [])
+
+    def test_interpreter_mismatch(self):
+        self.assertFalse(bench.interpreter_mismatch(_results(), _results()))
+        self.assertTrue(bench.interpreter_mismatch(_results(python='3.6.0'), _results()))
+        self.assertTrue(bench.interpreter_mismatch(_results(implementation='PyPy'), _results()))
+
+
+class MainTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, results):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            json.dump(results, f)
+        return path
+
+    def main(self, *argv):
+        stdout = StringIO()
+        with redirect_stdout(stdout), redirect_stderr(StringIO()):
+            status = bench.main(list(argv))
+        return status, stdout.getvalue()
+
+    def test_exit_codes(self):
+        baseline = self.write('baseline.json', _results(a=[1.0] * 5))
+        same = self.write('same.json', _results(a=[1.0] * 5))
+        slower = self.write('slower.json', _results(a=[2.0] * 5))
+        other = self.write('other.json', _results(python='3.6.0', a=[1.0] * 5))
+        self.assertEqual(self.main('--input', same, '--compare', baseline)[0], 0)
+        self.assertEqual(self.main('--input', slower, '--compare', baseline)[0], 1)
+        self.assertEqual(self.main('--input', other, '--compare', baseline)[0], 2)
+        self.assertEqual(self.main('--input', other, '--compare', baseline, '--ignore-interpreter')[0], 0)
+
+    def test_compare_mode_still_emits_results(self):
+        baseline = self.write('baseline.json', _results(a=[1.0] * 5))
+        slower = self.write('slower.json', _results(a=[2.0] * 5))
+        status, stdout = self.main('--input', slower, '--compare', baseline)
+        self.assertEqual(json.loads(stdout)['benchmarks']['a']['median'], 2.0)
+        output = os.path.join(self.directory, 'output.json')
+        self.main('--input', slower, '--compare', baseline, '--output', output)
+        with open(output) as f:
+            self.assertEqual(json.load(f)['benchmarks']['a']['median'], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import sys
+import inspect
+import unittest
+from functools import wraps, partial
+from cantrips.functions import (is_method, METHOD_CLASS, callable_kind, get_signature, normalize_arguments,
+                                CALLABLE_FUNCTION, CALLABLE_BOUND_METHOD, CALLABLE_CLASSMETHOD,
+                                CALLABLE_STATICMETHOD, CALLABLE_COROUTINE, CALLABLE_BUILTIN)
+
+
+def _closure(x_default, y_default):
+    def _function(x=x_default, y=y_default, *, z=x_default):
+        pass
+    return _function
+
+
+def _everything(a, b, c, d=4, *args, e, f=6, **kwargs):
+    pass
+
+
+if sys.version_info >= (3, 8):
+    # positional-only parameters are a syntax error before python 3.8.
+    exec("def _everything(a, b, /, c, d=4, *args, e, f=6, **kwargs):\n    pass")
+
+
+def _decorator(function):
+    @wraps(function)
+    def _wrapper(*args, **kwargs):
+        return function(*args, **kwargs)
+    return _wrapper
+
+
+@_decorator
+def _wrapped(a, b=2, *, c=3):
+    pass
+
+
+class _Sample(object):
+
+    def __init__(self, a=1):
+        pass
+
+    def __call__(self, q, r=4, *rest):
+        pass
+
+    def method(self, x, y=[1], **extra):
+        pass
+
+    @classmethod
+    def klass(cls, x, *, k=3):
+        pass
+
+    @staticmethod
+    def static(x=1, *args):
+        pass
+
+    async def coroutine(self, z):
+        pass
+
+
+class NormalizeArgumentsTest(unittest.TestCase):
+
+    def assertBindsLikeInspect(self, value, *args, **kwargs):
+        """
+        Checks normalize_arguments (twice, to also hit the cache) and get_signature
+          against what inspect tells. Binding errors must be TypeError in both.
+        """
+        try:
+            bound = inspect.signature(value).bind(*args, **kwargs)
+        except TypeError:
+            for _ in range(2):
+                with self.assertRaises(TypeError):
+                    normalize_arguments(value, args, kwargs)
+        else:
+            bound.apply_defaults()
+            for _ in range(2):
+                normalized = normalize_arguments(value, args, kwargs)
+                self.assertEqual((normalized.args, normalized.kwargs), (bound.args, bound.kwargs))
+        self.assertEqual(str(get_signature(value)), str(inspect.signature(value)))
+
+    def test_parameter_kinds(self):
+        self.assertBindsLikeInspect(_everything, 1, 2, 3, e=5)
+        self.assertBindsLikeInspect(_everything, 1, 2, c=3, e=5, g=7)
+        self.assertBindsLikeInspect(_everything, 1, 2, 3, 4, 5, 6, e=5, f=0)
+        self.assertBindsLikeInspect(_everything, 1, 2, 3)
+        self.assertBindsLikeInspect(_everything, 1, b=2, c=3, e=5)
+
+    def test_shared_code_closures(self):
+        self.assertBindsLikeInspect(_closure(1, 2))
+        self.assertBindsLikeInspect(_closure(3, 4))
+        self.assertBindsLikeInspect(_closure(5, 6), 0, z=1)
+
+    def test_mutated_defaults(self):
+        function = _closure(1, 2)
+        self.assertBindsLikeInspect(function, 0)
+        function.__defaults__ = None
+        self.assertBindsLikeInspect(function, 0)
+        self.assertBindsLikeInspect(function, 0, 1)
+        sibling = _closure(1, 2)
+        sibling.__defaults__ = (10, 20)
+        self.assertBindsLikeInspect(sibling)
+        sibling.__defaults__ = (30,)
+        self.assertBindsLikeInspect(sibling, 0)
+        self.assertBindsLikeInspect(sibling)
+
+    def test_mutated_kwdefaults(self):
+        function = _closure(1, 2)
+        self.assertBindsLikeInspect(function)
+        function.__kwdefaults__ = None
+        self.assertBindsLikeInspect(function)
+        self.assertBindsLikeInspect(function, z=0)
+        function.__kwdefaults__ = {'z': 9}
+        self.assertBindsLikeInspect(function)
+
+    def test_methods(self):
+        sample = _Sample()
+        self.assertBindsLikeInspect(sample.method, 1)
+        self.assertBindsLikeInspect(sample.method, 1, 2, w=3)
+        self.assertBindsLikeInspect(_Sample.klass, 1)
+        self.assertBindsLikeInspect(sample.klass, 1, k=0)
+        self.assertBindsLikeInspect(_Sample.static)
+        self.assertBindsLikeInspect(sample.static, 1, 2, 3)
+        self.assertBindsLikeInspect(sample.coroutine, 1)
+
+    def test_callable_instances_and_classes(self):
+        self.assertBindsLikeInspect(_Sample(), 1)
+        self.assertBindsLikeInspect(_Sample(), 1, 2, 3)
+        self.assertBindsLikeInspect(_Sample)
+        self.assertBindsLikeInspect(_Sample, 5)
+
+    def test_mutated_class(self):
+        class Mutable(object):
+            def __init__(self, a=1):
+                pass
+
+        self.assertBindsLikeInspect(Mutable)
+
+        def __init__(self, a=1, b=2):
+            pass
+
+        Mutable.__init__ = __init__
+        self.assertBindsLikeInspect(Mutable)
+
+    def test_keyword_named_like_the_owner(self):
+        sample = _Sample()
+        bound = inspect.signature(sample.method).bind(1, self=2)
+        bound.apply_defaults()
+        normalized = normalize_arguments(sample.method, (1,), {'self': 2})
+        self.assertEqual((normalized.args, normalized.kwargs), (bound.args, bound.kwargs))
+        self.assertEqual(normalized.self, 2)
+        self.assertBindsLikeInspect(sample.method, 1, cls=2)
+        self.assertBindsLikeInspect(_Sample.klass, 1, cls=2)
+        self.assertBindsLikeInspect(sample.method, 1, x=2)
+
+    def test_equal_code_objects(self):
+        first, second = {}, {}
+        exec(compile("def function(x: int):\n    pass", "first.py", "exec"), first)
+        exec(compile("def function(x: str):\n    pass", "second.py", "exec"), second)
+        self.assertEqual(first['function'].__code__, second['function'].__code__)
+        self.assertBindsLikeInspect(first['function'], 1)
+        self.assertBindsLikeInspect(second['function'], 1)
+
+    def test_mutated_annotations(self):
+        function = _closure(1, 2)
+        self.assertBindsLikeInspect(function)
+        function.__annotations__ = {'x': int}
+        self.assertBindsLikeInspect(function)
+
+    def test_instances_with_own_signature(self):
+        sample = _Sample()
+        sample.__signature__ = inspect.Signature([inspect.Parameter('z', inspect.Parameter.POSITIONAL_OR_KEYWORD)])
+        self.assertBindsLikeInspect(sample, 1)
+        sample = _Sample()
+        sample.__wrapped__ = _wrapped
+        self.assertBindsLikeInspect(sample, 1, c=2)
+
+    def test_wrapped_and_other_callables(self):
+        self.assertBindsLikeInspect(_wrapped, 1)
+        self.assertBindsLikeInspect(_wrapped, 1, c=0)
+        self.assertBindsLikeInspect(partial(_everything, 1, 2), 3, e=4)
+        self.assertBindsLikeInspect(divmod, 7, 2)
+
+
+class CallableKindTest(unittest.TestCase):
+
+    def test_kinds(self):
+        sample = _Sample()
+        self.assertEqual(callable_kind(_everything), CALLABLE_FUNCTION)
+        self.assertEqual(callable_kind(sample.method), CALLABLE_BOUND_METHOD)
+        self.assertEqual(callable_kind(_Sample.klass), CALLABLE_BOUND_METHOD | CALLABLE_CLASSMETHOD)
+        self.assertEqual(callable_kind(_Sample.__dict__['klass']), CALLABLE_CLASSMETHOD)
+        self.assertEqual(callable_kind(_Sample.__dict__['static']), CALLABLE_STATICMETHOD)
+        self.assertEqual(callable_kind(_Sample.static), CALLABLE_FUNCTION)
+        self.assertEqual(callable_kind(sample.coroutine), CALLABLE_BOUND_METHOD | CALLABLE_COROUTINE)
+        self.assertEqual(callable_kind(len), CALLABLE_BUILTIN)
+        self.assertEqual(callable_kind([].append), CALLABLE_BUILTIN | CALLABLE_BOUND_METHOD)
+        self.assertEqual(callable_kind(dict.fromkeys), CALLABLE_BUILTIN | CALLABLE_BOUND_METHOD | CALLABLE_CLASSMETHOD)
+        self.assertEqual(callable_kind(dict.__dict__['fromkeys']), CALLABLE_BUILTIN)
+        self.assertEqual(callable_kind(_Sample), 0)
+        self.assertEqual(callable_kind(sample), 0)
+
+    def test_is_method(self):
+        sample = _Sample()
+        self.assertTrue(is_method(sample.method))
+        self.assertTrue(is_method(_Sample.klass))
+        self.assertFalse(is_method(_everything))
+        self.assertFalse(is_method(sample.method, METHOD_CLASS))
+        self.assertTrue(is_method(_Sample.klass, METHOD_CLASS))
+
+
+if __name__ == '__main__':
+    unittest.main()